@@ -0,0 +1,38 @@
+"""
+Build opcional do analisador semântico compilado com mypyc.
+
+O compilador funciona normalmente só com o código Python em src/. Este script
+não instala nenhum pacote; ele apenas gera a extensão nativa de src/semantic.py
+(requer `pip install mypy setuptools`):
+
+    python build_mypyc.py
+
+O módulo compilado (.so/.pyd) fica ao lado de semantic.py e é importado no
+lugar dele; basta apagá-lo para voltar à versão em Python puro.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(ROOT, "src")
+
+
+def main():
+    try:
+        from mypyc.build import mypycify
+        from setuptools import setup
+    except ImportError:
+        print("Erro: mypyc/setuptools não encontrados. Instale com 'pip install mypy setuptools' "
+              "e rode 'python build_mypyc.py' novamente.", file=sys.stderr)
+        return 1
+
+    os.chdir(ROOT)
+    setup(
+        script_args=["build_ext", "--build-lib", SRC],
+        ext_modules=mypycify([os.path.join("src", "semantic.py")]),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
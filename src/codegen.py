@@ -1,160 +1,416 @@
+import io
 import json
 import sys
+import types
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 from datetime import datetime
-from collections import deque, defaultdict
+from collections import defaultdict
 from semantic import ParserNaive, build_symbol_table, SemanticAnalyzer
 
+# Ordens de execucao ja calculadas, reaproveitadas entre compilacoes do mesmo grafo
+EXECUTION_ORDER_CACHE_SIZE = 32
+_execution_order_cache = {}
+
 
 class IRGenerator:
 
     def __init__(self, symbol_table, source_file):
         self.symtab = symbol_table
         self.source_file = source_file
+        self._cached_ir = None
+        self._cache_key = None
+        self._cached_json = {}
+
+    def _current_cache_key(self):
+        return (self.symtab, self.symtab.version, self.source_file)
+
+    def _has_cached_ir(self):
+        return self._cached_ir is not None and self._cache_key == self._current_cache_key()
 
     def generate(self):
+        if self._has_cached_ir():
+            return self._cached_ir
+
+        tasks = self.symtab.all()
+        graph = self._generate_dependency_graph(tasks)
         ir = {
-            "metadata": self._generate_metadata(),
-            "artifacts": self._generate_artifacts(),
-            "tasks": self._generate_tasks(),
-            "dependencies": self._generate_dependency_graph(),
-            "execution_order": self._calculate_execution_order()
+            "metadata": self._generate_metadata(tasks),
+            "artifacts": self._generate_artifacts(tasks),
+            "tasks": self._generate_tasks(tasks),
+            "dependencies": graph,
+            "execution_order": self._calculate_execution_order(tasks, graph)
         }
+
+        self._cached_ir = ir
+        self._cache_key = self._current_cache_key()
+        self._cached_json.clear()
         return ir
 
-    def _generate_metadata(self):
+    def _generate_metadata(self, tasks):
         return {
             "compiler": "PipeLang Compiler v0.2",
             "source_file": self.source_file,
             "generated_at": datetime.now().isoformat(),
-            "total_tasks": len(self.symtab.all()),
+            "total_tasks": len(tasks),
             "format_version": "1.0"
         }
 
-    def _generate_artifacts(self):
-        artifacts = {}
+    def _generate_artifacts(self, tasks):
+        producers = {}
+        consumers = defaultdict(list)
 
-        for task in self.symtab.all():
-            for output in task.outputs:
-                if output not in artifacts:
-                    artifacts[output] = {
-                        "name": output,
-                        "produced_by": task.name,
-                        "consumed_by": []
-                    }
-
-        for task in self.symtab.all():
+        for task in tasks:
             for input_artifact in task.inputs:
-                if input_artifact in artifacts:
-                    artifacts[input_artifact]["consumed_by"].append(task.name)
-                else:
-                    artifacts[input_artifact] = {
-                        "name": input_artifact,
-                        "produced_by": None,
-                        "consumed_by": [task.name],
-                        "warning": "No producer found"
-                    }
-
-        return artifacts
+                consumers[input_artifact].append(task.name)
+            for output in task.outputs:
+                producers.setdefault(output, task.name)
 
-    def _generate_tasks(self):
-        tasks = []
-
-        for task in self.symtab.all():
-            task_ir = {
-                "id": task.name,
-                "type": task.kind,
-                "inputs": task.inputs,
-                "outputs": task.outputs,
-                "depends_on": task.depends,
-                "source_line": task.lineno,
-                "state": "pending"
+        artifacts = {}
+        for name, producer in producers.items():
+            artifacts[name] = {
+                "name": name,
+                "produced_by": producer,
+                "consumed_by": consumers.get(name, [])
             }
-            tasks.append(task_ir)
-
-        return tasks
 
-    def _generate_dependency_graph(self):
-        graph = {}
+        for name, consumed_by in consumers.items():
+            if name not in producers:
+                artifacts[name] = {
+                    "name": name,
+                    "produced_by": None,
+                    "consumed_by": consumed_by,
+                    "warning": "No producer found"
+                }
 
-        for task in self.symtab.all():
-            graph[task.name] = task.depends[:]
-
-        return graph
+        return artifacts
 
-    def _calculate_execution_order(self):
-        in_degree = defaultdict(int)
-        adj_list = defaultdict(list)
+    def _generate_tasks(self, tasks):
+        return [self._generate_task(task) for task in tasks]
 
-        all_tasks = set()
-        for task in self.symtab.all():
-            all_tasks.add(task.name)
-            for dep in task.depends:
-                adj_list[dep].append(task.name)
-                in_degree[task.name] += 1
+    def _generate_task(self, task):
+        return {
+            "id": task.name,
+            "type": task.kind,
+            "inputs": task.inputs,
+            "outputs": task.outputs,
+            "depends_on": task.depends,
+            "source_line": task.lineno,
+            "state": "pending"
+        }
 
-        queue = deque([task for task in all_tasks if in_degree[task] == 0])
-        execution_order = []
+    def _generate_dependency_graph(self, tasks):
+        # A IR e somente leitura: as listas sao as mesmas da tabela de simbolos,
+        # assim como em "tasks", e nao devem ser alteradas por quem consome a IR
+        return {task.name: task.depends for task in tasks}
+
+    def _calculate_execution_order(self, tasks, graph):
+        # A ordem de declaracao faz parte da chave: ela define a ordem entre tarefas independentes
+        key = tuple(task_signature(task) for task in tasks)
+        order = _execution_order_cache.get(key)
+
+        if order is None:
+            order = self._sort_tasks(graph)
+            if len(_execution_order_cache) >= EXECUTION_ORDER_CACHE_SIZE:
+                del _execution_order_cache[next(iter(_execution_order_cache))]
+            _execution_order_cache[key] = order
+
+        # Copia para que a IR gerada nao compartilhe listas com o cache
+        if isinstance(order, list):
+            return list(order)
+        return {key: list(value) if isinstance(value, list) else value
+                for key, value in order.items()}
+
+    def _sort_tasks(self, graph):
+        order = self._calculate_execution_order_kahn(graph)
+        if order is not None:
+            return order
+
+        # So quando a ordenacao falha: localiza o ciclo para reportar as tarefas envolvidas
+        components = strongly_connected_components(graph)
+        return {
+            "error": "Cycle detected - cannot determine execution order",
+            "cycle": find_cycle(graph, components),
+            "partial_order": acyclic_prefix(graph, components)
+        }
 
-        while queue:
-            current = queue.popleft()
-            execution_order.append(current)
+    def _calculate_execution_order_kahn(self, graph):
+        # Mesma ordem de graphlib.TopologicalSorter(graph).static_order(): nos na
+        # ordem em que aparecem no grafo (cada tarefa seguida das dependencias) e
+        # fila FIFO. Retorna None se sobrar algum no, ou seja, se houver ciclo
+        in_degree = {}
+        adj_list = {}
+
+        for name, depends in graph.items():
+            if name not in in_degree:
+                in_degree[name] = 0
+                adj_list[name] = []
+            in_degree[name] += len(depends)
+            for dep in depends:
+                if dep not in in_degree:
+                    in_degree[dep] = 0
+                    adj_list[dep] = []
+                adj_list[dep].append(name)
+
+        queue = [node for node, degree in in_degree.items() if degree == 0]
+        head = 0
+
+        while head < len(queue):
+            current = queue[head]
+            head += 1
 
             for neighbor in adj_list[current]:
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
 
-        if len(execution_order) != len(all_tasks):
-            return {
-                "error": "Cycle detected - cannot determine execution order",
-                "partial_order": execution_order
-            }
+        if len(queue) != len(in_degree):
+            return None
 
-        return execution_order
+        # Dependencias nao declaradas entram na ordenacao, mas nao na ordem de execucao
+        if len(queue) != len(graph):
+            return [node for node in queue if node in graph]
+        return queue
 
     def to_json(self, indent=2):
         ir = self.generate()
-        return json.dumps(ir, indent=indent, ensure_ascii=False)
+        key = (id(ir), indent)
+        text = self._cached_json.get(key)
+        if text is None:
+            text = self._cached_json[key] = dumps_ir(ir, indent=indent)
+        return text
 
     def save_to_file(self, output_path, indent=2):
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(self.to_json(indent=indent))
+        if not self._has_cached_ir():
+            self.save_to_file_streaming(output_path, indent=indent)
+            return
+
+        # IR ja gerada: reaproveita o JSON se ja serializado, senao o dicionario
+        text = self._cached_json.get((id(self._cached_ir), indent))
+        if text is None:
+            save_ir_dict(self._cached_ir, output_path, indent=indent)
+            return
+
+        with open(output_path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+
+    def save_to_file_streaming(self, output_path, indent=2):
+        # Escreve cada secao da IR direto no arquivo, sem montar a string inteira
+        tasks = self.symtab.all()
+        graph = self._generate_dependency_graph(tasks)
+        sections = [
+            ("metadata", self._generate_metadata(tasks)),
+            ("artifacts", self._generate_artifacts(tasks)),
+            ("tasks", (self._generate_task(task) for task in tasks)),
+            ("dependencies", graph),
+            ("execution_order", self._calculate_execution_order(tasks, graph)),
+        ]
+
+        with open(output_path, 'wb') as f:
+            _write_ir_sections(f, sections, indent)
+
+
+def save_ir_dict(ir, output_path, indent=2):
+    with open(output_path, 'wb') as f:
+        _write_ir_sections(f, ir.items(), indent)
+
+
+def _write_ir_sections(f, sections, indent):
+    # Listas (e geradores) sao escritas item a item, no mesmo formato de dumps_ir
+    pad = b" " * (indent or 0)
+    nl = b"\n" if indent else b""
+    sep = b": " if indent else b":"
+    write = f.write
+
+    def dump(value, level):
+        return dumps_ir_bytes(value, indent=indent).replace(b"\n", b"\n" + pad * level)
+
+    write(b"{")
+    for position, (key, value) in enumerate(sections):
+        write((b"," if position else b"") + nl + pad + dumps_ir_bytes(key) + sep)
+
+        if not isinstance(value, (list, types.GeneratorType)):
+            write(dump(value, 1))
+            continue
+
+        first = True
+        for item in value:
+            write((b"[" if first else b",") + nl + pad * 2)
+            write(dump(item, 2))
+            first = False
+        write(b"[]" if first else nl + pad + b"]")
+    write(nl + b"}")
+
+
+def strongly_connected_components(graph):
+    """
+    Tarjan iterativo sobre o grafo tarefa -> dependencias.
+    Retorna as componentes com as dependencias sempre antes dos dependentes.
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in graph:
+                    continue
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(graph[neighbor])))
+                    break
+                if neighbor in on_stack and index[neighbor] < lowlink[node]:
+                    lowlink[node] = index[neighbor]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def _is_cyclic(graph, component):
+    return len(component) > 1 or component[0] in graph[component[0]]
+
+
+def find_cycle(graph, components):
+    """Retorna o primeiro ciclo encontrado (ex.: [A, B, A]) ou None."""
+    for component in components:
+        if not _is_cyclic(graph, component):
+            continue
+
+        members = set(component)
+        path = [component[0]]
+        position = {component[0]: 0}
+        while True:
+            node = next(dep for dep in graph[path[-1]] if dep in members)
+            if node in position:
+                return path[position[node]:] + [node]
+            position[node] = len(path)
+            path.append(node)
+
+    return None
+
+
+def acyclic_prefix(graph, components):
+    """Tarefas que podem executar antes de esbarrar em um ciclo."""
+    blocked = set()
+    order = []
+    for component in components:
+        if _is_cyclic(graph, component):
+            blocked.update(component)
+            continue
+
+        node = component[0]
+        if any(dep in blocked for dep in graph[node]):
+            blocked.add(node)
+        else:
+            order.append(node)
+
+    return order
+
+
+def task_signature(task):
+    return (task.name, task.kind, tuple(task.inputs), tuple(task.outputs), tuple(task.depends))
+
+
+def dumps_ir_bytes(ir, indent=2):
+    # orjson so aceita indentacao de 2 espacos; outros valores usam o fallback
+    if orjson is not None and indent in (2, 0, None):
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(ir, option=option)
+    return dumps_ir(ir, indent=indent).encode('utf-8')
+
+
+def dumps_ir(ir, indent=2):
+    # Sem indentacao (0 ou None) todos os backends geram JSON compacto, sem espacos,
+    # que e o formato reproduzido por _write_ir_sections
+    if orjson is not None and indent in (2, 0, None):
+        return dumps_ir_bytes(ir, indent=indent).decode('utf-8')
+    if ujson is not None:
+        return ujson.dumps(ir, indent=indent or 0, ensure_ascii=False, escape_forward_slashes=False)
+    if not indent:
+        return json.dumps(ir, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(ir, indent=indent, ensure_ascii=False)
 
 
 def generate_pseudo_code(ir):
-    lines = []
-    lines.append("=" * 60)
-    lines.append("PSEUDO-CODIGO DO PIPELINE")
-    lines.append("=" * 60)
-    lines.append(f"# Fonte: {ir['metadata']['source_file']}")
-    lines.append(f"# Tarefas: {ir['metadata']['total_tasks']}")
-    lines.append("")
+    buf = io.StringIO()
+    generate_pseudo_code_to(ir, buf)
+    return buf.getvalue()
+
+
+def generate_pseudo_code_to(ir, stream):
+    w = stream.write
+    w("=" * 60 + "\n")
+    w("PSEUDO-CODIGO DO PIPELINE\n")
+    w("=" * 60 + "\n")
+    w(f"# Fonte: {ir['metadata']['source_file']}\n")
+    w(f"# Tarefas: {ir['metadata']['total_tasks']}\n")
+    w("\n")
 
     if isinstance(ir['execution_order'], list):
-        lines.append("ORDEM DE EXECUCAO:")
+        w("ORDEM DE EXECUCAO:\n")
         for i, task_name in enumerate(ir['execution_order'], 1):
-            lines.append(f"  {i}. {task_name}")
-        lines.append("")
+            w(f"  {i}. {task_name}\n")
+        w("\n")
 
-    lines.append("TAREFAS:")
+    w("TAREFAS:\n")
     for task in ir['tasks']:
-        lines.append(f"\nTASK {task['id']} ({task['type']}):")
+        w(f"\nTASK {task['id']} ({task['type']}):\n")
 
         if task['depends_on']:
-            lines.append(f"  WAIT_FOR: {', '.join(task['depends_on'])}")
+            w(f"  WAIT_FOR: {', '.join(task['depends_on'])}\n")
 
         if task['inputs']:
-            lines.append(f"  READ: {', '.join(task['inputs'])}")
+            w(f"  READ: {', '.join(task['inputs'])}\n")
 
-        lines.append(f"  EXECUTE: {task['type'].lower()}_operation()")
+        w(f"  EXECUTE: {task['type'].lower()}_operation()\n")
 
         if task['outputs']:
-            lines.append(f"  WRITE: {', '.join(task['outputs'])}")
+            w(f"  WRITE: {', '.join(task['outputs'])}\n")
 
-        lines.append(f"  MARK_COMPLETE: {task['id']}")
+        w(f"  MARK_COMPLETE: {task['id']}\n")
 
-    lines.append("\n" + "=" * 60)
-    return "\n".join(lines)
+    w("\n" + "=" * 60)
 
 
 def main():
@@ -199,7 +455,8 @@ def main():
     print(generator.to_json())
 
     print("\n[PSEUDO] REPRESENTACAO EM PSEUDO-CODIGO:")
-    print(generate_pseudo_code(ir))
+    generate_pseudo_code_to(ir, sys.stdout)
+    print()
 
     if output_path:
         generator.save_to_file(output_path)
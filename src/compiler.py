@@ -5,7 +5,7 @@ import tempfile
 from lexer import AnalisadorLexico, ErroLexico
 from parser import AnalisadorSintatico, ErroSintatico, Pipeline, Tarefa
 from semantic import Task, SymbolTable, SemanticAnalyzer, dump_symbol_table
-from codegen import IRGenerator, generate_pseudo_code
+from codegen import IRGenerator, generate_pseudo_code_to, save_ir_dict
 
 
 class ASTConverter:
@@ -17,18 +17,23 @@ class ASTConverter:
         return tasks
 
     def _convert_tarefa(self, tarefa: Tarefa):
-        depends = tarefa.dependencias if tarefa.dependencias else []
-        kind = self._infer_task_kind(tarefa)
+        origem = tarefa.origem
+        saida = tarefa.saida
+        depends = tarefa.dependencias or []
+        kind = self._infer_task_kind(origem, saida, depends, tarefa.transformacao)
+
+        fonte = [origem.fonte] if origem else []
+        destino = [saida.destino] if saida else []
 
         if kind == "EXTRACT":
             inputs = []
-            outputs = [tarefa.saida.destino] if tarefa.saida else []
+            outputs = destino
         elif kind == "LOAD":
-            inputs = [tarefa.origem.fonte] if tarefa.origem else []
+            inputs = fonte
             outputs = []
         else:
-            inputs = [tarefa.origem.fonte] if tarefa.origem else []
-            outputs = [tarefa.saida.destino] if tarefa.saida else []
+            inputs = fonte
+            outputs = destino
 
         return Task(
             name=tarefa.nome,
@@ -39,12 +44,12 @@ class ASTConverter:
             lineno=0
         )
 
-    def _infer_task_kind(self, tarefa: Tarefa):
-        if tarefa.transformacao:
+    def _infer_task_kind(self, origem, saida, depends, transformacao):
+        if transformacao:
             return "TRANSFORM"
-        elif tarefa.origem and not tarefa.dependencias:
+        elif origem and not depends:
             return "EXTRACT"
-        elif tarefa.saida and tarefa.dependencias:
+        elif saida and depends:
             return "LOAD"
         else:
             return "TRANSFORM"
@@ -57,6 +62,7 @@ class PipeLangCompiler:
         self.ast = None
         self.tasks = None
         self.symbol_table = None
+        self.generator = None
         self.errors = []
 
     def compile_from_file(self, file_path):
@@ -113,8 +119,8 @@ class PipeLangCompiler:
         print(f"      Nenhum erro semantico encontrado")
 
         print(f"[5/5] Geracao de Codigo Intermediario...")
-        generator = IRGenerator(self.symbol_table, source_name)
-        self.ir = generator.generate()
+        self.generator = IRGenerator(self.symbol_table, source_name)
+        self.ir = self.generator.generate()
         print(f"      IR gerada com sucesso")
 
         return True
@@ -129,18 +135,17 @@ class PipeLangCompiler:
             print("\n" + "=" * 60)
             print("CODIGO INTERMEDIARIO (JSON):")
             print("=" * 60)
-            generator = IRGenerator(self.symbol_table, "<compiled>")
-            print(generator.to_json())
+            print(self.generator.to_json())
 
     def print_pseudo_code(self):
         if hasattr(self, 'ir'):
             print("\n" + "=" * 60)
-            print(generate_pseudo_code(self.ir))
+            generate_pseudo_code_to(self.ir, sys.stdout)
+            print()
 
     def save_ir(self, output_path):
         if hasattr(self, 'ir'):
-            generator = IRGenerator(self.symbol_table, "<compiled>")
-            generator.save_to_file(output_path)
+            save_ir_dict(self.ir, output_path)
             print(f"\n[SAVE] IR salva em: {output_path}")
 
 
@@ -154,12 +159,15 @@ def main():
     parser.add_argument('output', nargs='?', help='Arquivo de saida .json (opcional)')
     parser.add_argument('--simulate', '-s', action='store_true',
                        help='Executar simulador apos compilacao bem-sucedida')
+    parser.add_argument('--fast', action='store_true',
+                       help='Simular sem os atrasos artificiais de cada tarefa')
 
     args = parser.parse_args()
 
     source_path = args.source
     output_path = args.output
     run_simulator = args.simulate
+    fast_mode = args.fast
 
     print("=" * 60)
     print("COMPILADOR PIPELANG")
@@ -199,7 +207,7 @@ def main():
             # Importa e executa o simulador
             try:
                 from simulator import PipelineSimulator
-                simulator = PipelineSimulator(ir_file)
+                simulator = PipelineSimulator(ir_file, fast_mode=fast_mode)
                 success = simulator.run()
 
                 # Se usou arquivo temporario, remove
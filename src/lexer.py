@@ -1,4 +1,5 @@
 import re
+import sys
 from dataclasses import dataclass
 
 PALAVRAS_CHAVE = {
@@ -13,8 +14,10 @@ PALAVRAS_CHAVE = {
     "or"
 }
 
+TOKENS_IGNORADOS = frozenset(("ESPACO", "COMENTARIO_LINHA"))
+
 ESPECIFICACAO_TOKENS = [
-    ("COMENTARIO_BLOCO",  r"/\*.*?\*/", re.S),
+    ("COMENTARIO_BLOCO",  r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"),
     ("COMENTARIO_LINHA",  r"//[^\n]*"),
 
     ("NOVA_LINHA",        r"\n"),
@@ -49,6 +52,16 @@ ESPECIFICACAO_TOKENS = [
     ("PONTO",             r"\."),
 ]
 
+# Tipos de token internados: o parser compara com literais (já internados pelo
+# Python), e a comparação de strings internadas se resolve pela identidade
+TOKEN_TYPES = {nome: sys.intern(nome) for nome, *_ in ESPECIFICACAO_TOKENS}
+for palavra in PALAVRAS_CHAVE:
+    tipo = f"PC_{palavra.upper()}"
+    TOKEN_TYPES[tipo] = sys.intern(tipo)
+TOKEN_TYPES["FIM_ARQUIVO"] = sys.intern("FIM_ARQUIVO")
+
+TIPOS_PALAVRAS_CHAVE = {palavra: TOKEN_TYPES[f"PC_{palavra.upper()}"] for palavra in PALAVRAS_CHAVE}
+
 partes = []
 flags = 0
 for nome, padrao, *extra in ESPECIFICACAO_TOKENS:
@@ -57,8 +70,16 @@ for nome, padrao, *extra in ESPECIFICACAO_TOKENS:
         flags |= extra[0]
 REGEX_MESTRE = re.compile("|".join(partes), flags)
 
+# Nome do token por índice de grupo, para usar match.lastindex no laço do lexer
+NOMES_GRUPOS = [None] * (REGEX_MESTRE.groups + 1)
+for nome, indice in REGEX_MESTRE.groupindex.items():
+    NOMES_GRUPOS[indice] = TOKEN_TYPES[nome]
+NOMES_GRUPOS = tuple(NOMES_GRUPOS)
+
 @dataclass
 class Token:
+    __slots__ = ("tipo", "lexema", "linha", "coluna")
+
     tipo: str
     lexema: str
     linha: int
@@ -70,6 +91,33 @@ class Token:
     def __repr__(self):
         return self.__str__()
 
+class TokenStream:
+    """
+    Sequência de tokens guardada em listas paralelas (tipo, lexema, linha, coluna).
+    Os objetos Token só são criados quando um item é acessado.
+    """
+
+    def __init__(self):
+        self.tipos = []
+        self.lexemas = []
+        self.linhas = []
+        self.colunas = []
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        return Token(self.tipos[indice], self.lexemas[indice],
+                     self.linhas[indice], self.colunas[indice])
+
+    def __iter__(self):
+        return map(Token, self.tipos, self.lexemas, self.linhas, self.colunas)
+
+    def __repr__(self):
+        return repr(list(self))
+
 class ErroLexico(Exception):
     def __init__(self, mensagem, linha, coluna):
         super().__init__(f"[Linha {linha}, Coluna {coluna}] Erro Léxico: {mensagem}")
@@ -83,56 +131,74 @@ class AnalisadorLexico:
         self.inicio_linha = 0
 
     def analisar(self):
-        tokens = []
+        tokens = TokenStream()
+        add_tipo = tokens.tipos.append
+        add_lexema = tokens.lexemas.append
+        add_linha = tokens.linhas.append
+        add_coluna = tokens.colunas.append
         posicao = 0
         codigo = self.codigo_fonte
-
-        match = REGEX_MESTRE.match(codigo, posicao)
-
-        while match:
-            tipo_token = match.lastgroup
-            lexema = match.group(tipo_token)
-            inicio = match.start()
-            coluna = (inicio - self.inicio_linha) + 1
-
-            if tipo_token == "NOVA_LINHA":
-                self.linha_atual += 1
-                self.inicio_linha = match.end()
-
-            elif tipo_token in ("ESPACO", "COMENTARIO_LINHA", "COMENTARIO_BLOCO"):
-                if tipo_token == "COMENTARIO_BLOCO":
-                    num_quebras = lexema.count("\n")
-                    if num_quebras:
-                        self.linha_atual += num_quebras
-                        ultima_quebra = lexema.rfind("\n")
-                        if ultima_quebra != -1:
-                            self.inicio_linha = match.start() + ultima_quebra + 1
-
-            elif tipo_token == "IDENTIFICADOR":
-                lexema_lower = lexema.lower()
-                if lexema_lower in PALAVRAS_CHAVE:
-                    tipo_final = f"PC_{lexema_lower.upper()}"
-                else:
-                    tipo_final = "IDENTIFICADOR"
-                tokens.append(Token(tipo_final, lexema, self.linha_atual, coluna))
+        linha = self.linha_atual
+        inicio_linha = self.inicio_linha
+
+        for match in REGEX_MESTRE.finditer(codigo):
+            inicio, fim = match.span()
+            if inicio != posicao:
+                # finditer pulou um trecho que nenhum token reconhece
+                break
+
+            indice = match.lastindex
+            tipo_token = NOMES_GRUPOS[indice]
+            lexema = match.group(indice)
+            coluna = (inicio - inicio_linha) + 1
+
+            if tipo_token == "IDENTIFICADOR":
+                tipo_final = TIPOS_PALAVRAS_CHAVE.get(lexema)
+                if tipo_final is None:
+                    tipo_final = TIPOS_PALAVRAS_CHAVE.get(lexema.lower(), "IDENTIFICADOR")
+                add_tipo(tipo_final)
+                add_lexema(lexema)
+                add_linha(linha)
+                add_coluna(coluna)
+
+            elif tipo_token in TOKENS_IGNORADOS:
+                pass
+
+            elif tipo_token == "NOVA_LINHA":
+                linha += 1
+                inicio_linha = fim
+
+            elif tipo_token == "COMENTARIO_BLOCO":
+                # rfind percorre o fim do comentário e count só o trecho restante
+                ultima_quebra = lexema.rfind("\n")
+                if ultima_quebra != -1:
+                    linha += lexema.count("\n", 0, ultima_quebra) + 1
+                    inicio_linha = inicio + ultima_quebra + 1
 
             else:
-                tokens.append(Token(tipo_token, lexema, self.linha_atual, coluna))
+                add_tipo(tipo_token)
+                add_lexema(lexema)
+                add_linha(linha)
+                add_coluna(coluna)
+
+            posicao = fim
 
-            posicao = match.end()
-            match = REGEX_MESTRE.match(codigo, posicao)
+        self.linha_atual = linha
+        self.inicio_linha = inicio_linha
 
         if posicao != len(codigo):
             caractere_invalido = codigo[posicao]
-            coluna = (posicao - self.inicio_linha) + 1
+            coluna = (posicao - inicio_linha) + 1
             raise ErroLexico(
                 f"Caractere não reconhecido: {repr(caractere_invalido)}",
-                self.linha_atual,
+                linha,
                 coluna
             )
 
-        tokens.append(Token("FIM_ARQUIVO", "$", self.linha_atual,
-                          (len(codigo) - self.inicio_linha) + 1))
+        add_tipo("FIM_ARQUIVO")
+        add_lexema("$")
+        add_linha(linha)
+        add_coluna((len(codigo) - inicio_linha) + 1)
 
         return tokens
 
@@ -1,87 +1,204 @@
+import operator
 from dataclasses import dataclass, field
 from typing import List, Optional, Union
 
+OPERADORES_COMPARACAO = frozenset({
+    "IGUAL", "DIFERENTE", "MENOR", "MAIOR", "MENOR_IGUAL", "MAIOR_IGUAL"
+})
+
+CONVERSORES_VALOR = {
+    "STRING": lambda lexema: lexema.strip("'"),
+    "NUMERO": lambda lexema: float(lexema) if '.' in lexema else int(lexema),
+    "IDENTIFICADOR": lambda lexema: lexema,
+}
+
+FUNCOES_COMPARACAO = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+    ">": operator.gt, "<=": operator.le, ">=": operator.ge,
+}
+
+def _comparar(valor_campo, operador, valor):
+    # Versão protegida de uma comparação: campo ausente ou tipos incompatíveis dão False
+    if valor_campo is None:
+        return False
+    try:
+        return FUNCOES_COMPARACAO[operador](valor_campo, valor)
+    except TypeError:
+        return False
+
 @dataclass
 class NoAST:
-    pass
+    # A AST não muda depois da análise, então o texto de cada nó é calculado uma vez
+    __slots__ = ("_str_cache",)
+
+    def __str__(self):
+        texto = getattr(self, "_str_cache", None)
+        if texto is None:
+            texto = self._str_cache = self._formatar()
+        return texto
+
+    def _formatar(self):
+        return repr(self)
 
 @dataclass
 class Pipeline(NoAST):
+    __slots__ = ("nome", "tarefas")
+
     nome: str
     tarefas: List['Tarefa']
 
-    def __str__(self):
+    def _formatar(self):
         tarefas_str = '\n  '.join(str(t) for t in self.tarefas)
         return f"Pipeline '{self.nome}':\n  {tarefas_str}"
 
 @dataclass
 class Tarefa(NoAST):
+    __slots__ = ("nome", "origem", "transformacao", "saida", "dependencias")
+
     nome: str
     origem: 'Origem'
     transformacao: Optional['Transformacao']
     saida: 'Saida'
     dependencias: Optional[List[str]]
 
-    def __str__(self):
+    def _formatar(self):
         deps = f" (depende de: {', '.join(self.dependencias)})" if self.dependencias else ""
         trans = f"\n    {self.transformacao}" if self.transformacao else ""
         return f"Task '{self.nome}': {self.origem} -> {self.saida}{trans}{deps}"
 
 @dataclass
 class Origem(NoAST):
+    __slots__ = ("fonte",)
+
     fonte: str
 
-    def __str__(self):
+    def _formatar(self):
         return f"from '{self.fonte}'"
 
 @dataclass
 class Saida(NoAST):
+    __slots__ = ("destino",)
+
     destino: str
 
-    def __str__(self):
+    def _formatar(self):
         return f"to '{self.destino}'"
 
 @dataclass
 class Transformacao(NoAST):
-    pass
+    __slots__ = ()
 
 @dataclass
 class TransformacaoMap(Transformacao):
+    __slots__ = ("campo", "valor")
+
     campo: str
     valor: Union[str, float]
 
-    def __str__(self):
+    def _formatar(self):
         return f"map {self.campo} = {self.valor}"
 
 @dataclass
 class TransformacaoFilter(Transformacao):
+    # _predicate não é campo do dataclass: fica fora de repr/eq
+    __slots__ = ("expressao", "_predicate")
+
     expressao: 'ExpressaoLogica'
 
-    def __str__(self):
+    @property
+    def predicate(self):
+        # Compilado só no primeiro acesso; a AST não muda depois da análise
+        predicate = getattr(self, "_predicate", None)
+        if predicate is None:
+            predicate = self._predicate = self.expressao.compile()
+        return predicate
+
+    def _formatar(self):
         return f"filter {self.expressao}"
 
 @dataclass
 class ExpressaoLogica(NoAST):
-    pass
+    __slots__ = ()
+
+    def compile(self):
+        """
+        Traduz a expressão uma única vez para uma função record -> bool.
+        Uma comparação com campo ausente ou de tipo incompatível vale False.
+        """
+        codigo = compile(f"lambda record: {self._codigo_python()}", "<filter>", "eval")
+        rapido = eval(codigo, {"__builtins__": {}})
+        # Só usada quando a versão rápida esbarra em tipos incompatíveis
+        codigo = compile(f"lambda record: {self._codigo_python(True)}", "<filter>", "eval")
+        protegido = eval(codigo, {"__builtins__": {}, "_comparar": _comparar})
+
+        def predicado(record):
+            try:
+                return rapido(record)
+            except TypeError:
+                return protegido(record)
+        return predicado
 
 @dataclass
 class ExpressaoBinaria(ExpressaoLogica):
+    __slots__ = ("esquerda", "operador", "direita")
+
     esquerda: ExpressaoLogica
     operador: str
     direita: ExpressaoLogica
 
-    def __str__(self):
-        return f"({self.esquerda} {self.operador} {self.direita})"
+    def _formatar(self):
+        # Cadeias de and/or crescem pela esquerda; percorre essa espinha sem recursão
+        pilha = []
+        no = self
+        while isinstance(no, ExpressaoBinaria) and getattr(no, "_str_cache", None) is None:
+            pilha.append(no)
+            no = no.esquerda
+
+        texto = str(no)
+        for no in reversed(pilha):
+            texto = no._str_cache = f"({texto} {no.operador} {no.direita})"
+        return texto
+
+    def _codigo_python(self, protegido=False):
+        # Mesma espinha iterativa de _formatar. Em Python "and" já tem precedência
+        # sobre "or", então só um "or" dentro de um "and" precisa de parênteses;
+        # assim o aninhamento gerado acompanha o do código-fonte, não o tamanho da cadeia
+        pilha = []
+        no = self
+        while isinstance(no, ExpressaoBinaria):
+            pilha.append(no)
+            no = no.esquerda
+
+        codigo = no._codigo_python(protegido)
+        anterior = None
+        for no in reversed(pilha):
+            if anterior == "or" and no.operador == "and":
+                codigo = f"({codigo})"
+            direita = no.direita
+            codigo_direita = direita._codigo_python(protegido)
+            if no.operador == "and" and isinstance(direita, ExpressaoBinaria) and direita.operador == "or":
+                codigo_direita = f"({codigo_direita})"
+            codigo = f"{codigo} {no.operador} {codigo_direita}"
+            anterior = no.operador
+        return codigo
 
 @dataclass
 class ExpressaoComparacao(ExpressaoLogica):
+    __slots__ = ("campo", "operador", "valor")
+
     campo: str
     operador: str
     valor: Union[str, float, int]
 
-    def __str__(self):
+    def _formatar(self):
         return f"{self.campo} {self.operador} {self.valor}"
 
+    def _codigo_python(self, protegido=False):
+        if protegido:
+            return f"_comparar(record.get({self.campo!r}), {self.operador!r}, {self.valor!r})"
+        # Campo ausente (ou None) torna a comparação falsa em vez de TypeError
+        return f"((v := record.get({self.campo!r})) is not None and v {self.operador} {self.valor!r})"
+
 class ErroSintatico(Exception):
     def __init__(self, mensagem, linha=None, coluna=None):
         if linha and coluna:
@@ -95,42 +212,68 @@ class ErroSintatico(Exception):
 class AnalisadorSintatico:
     def __init__(self, tokens):
         self.tokens = tokens
+        # Lê tipos e lexemas direto das listas do TokenStream; Token só é montado
+        # (via token_atual) para mensagens de erro
+        if hasattr(tokens, "tipos"):
+            self.tipos = tokens.tipos
+            self.lexemas = tokens.lexemas
+        else:
+            self.tipos = [token.tipo for token in tokens]
+            self.lexemas = [token.lexema for token in tokens]
+        self.total_tokens = len(self.tipos)
         self.posicao = 0
-        self.token_atual = tokens[0] if tokens else None
+        self.tipo_atual = self.tipos[0] if self.total_tokens else None
+
+    @property
+    def token_atual(self):
+        if self.posicao < self.total_tokens:
+            return self.tokens[self.posicao]
+        return None
 
     def avancar(self):
-        self.posicao += 1
-        if self.posicao < len(self.tokens):
-            self.token_atual = self.tokens[self.posicao]
+        posicao = self.posicao + 1
+        self.posicao = posicao
+        if posicao < self.total_tokens:
+            self.tipo_atual = self.tipos[posicao]
         else:
-            self.token_atual = None
+            self.tipo_atual = None
 
     def verificar(self, tipo_esperado):
-        return self.token_atual and self.token_atual.tipo == tipo_esperado
+        return self.tipo_atual == tipo_esperado
 
     def consumir(self, tipo_esperado):
-        if not self.token_atual:
+        tipo = self.tipo_atual
+        if tipo is None:
             raise ErroSintatico(f"Fim inesperado do arquivo. Esperado: {tipo_esperado}")
 
-        if self.token_atual.tipo != tipo_esperado:
+        if tipo != tipo_esperado:
+            token = self.token_atual
             raise ErroSintatico(
-                f"Token inesperado. Esperado: {tipo_esperado}, Encontrado: {self.token_atual.tipo}",
-                self.token_atual.linha,
-                self.token_atual.coluna
+                f"Token inesperado. Esperado: {tipo_esperado}, Encontrado: {tipo}",
+                token.linha,
+                token.coluna
             )
 
-        lexema = self.token_atual.lexema
+        lexema = self.lexemas[self.posicao]
+        self.avancar()
+        return lexema
+
+    def _consume_fast(self, tipo_esperado):
+        # Só para pontos onde o tipo do token atual já foi verificado
+        assert self.tipo_atual == tipo_esperado
+        lexema = self.lexemas[self.posicao]
         self.avancar()
         return lexema
 
     def analisar(self):
         ast = self.pipeline()
 
-        if self.token_atual and self.token_atual.tipo != "FIM_ARQUIVO":
+        if self.tipo_atual is not None and self.tipo_atual != "FIM_ARQUIVO":
+            token = self.token_atual
             raise ErroSintatico(
-                f"Token inesperado após o fim do pipeline: {self.token_atual.tipo}",
-                self.token_atual.linha,
-                self.token_atual.coluna
+                f"Token inesperado após o fim do pipeline: {token.tipo}",
+                token.linha,
+                token.coluna
             )
 
         return ast
@@ -146,7 +289,7 @@ class AnalisadorSintatico:
 
     def lista_tarefas(self):
         tarefas = []
-        if not self.verificar("PC_TASK"):
+        if self.tipo_atual != "PC_TASK":
             raise ErroSintatico(
                 "Esperado pelo menos uma tarefa no pipeline",
                 self.token_atual.linha if self.token_atual else None,
@@ -155,12 +298,13 @@ class AnalisadorSintatico:
 
         tarefas.append(self.tarefa())
 
-        while self.verificar("PONTO_VIRGULA"):
+        while self.tipo_atual == "PONTO_VIRGULA":
             self.avancar()
 
-            if self.verificar("PC_TASK"):
+            tipo = self.tipo_atual
+            if tipo == "PC_TASK":
                 tarefas.append(self.tarefa())
-            elif self.verificar("FECHA_CHAVES"):
+            elif tipo == "FECHA_CHAVES":
                 break
             else:
                 raise ErroSintatico(
@@ -172,7 +316,7 @@ class AnalisadorSintatico:
         return tarefas
 
     def tarefa(self):
-        self.consumir("PC_TASK")
+        self._consume_fast("PC_TASK")
         nome = self.consumir("IDENTIFICADOR")
 
         origem, transformacao, saida, dependencias = self.bloco_tarefa()
@@ -180,19 +324,19 @@ class AnalisadorSintatico:
         return Tarefa(nome, origem, transformacao, saida, dependencias)
 
     def bloco_tarefa(self):
-        if self.verificar("ABRE_CHAVES"):
+        if self.tipo_atual == "ABRE_CHAVES":
             self.avancar()
 
             origem = self.origem()
 
             transformacao = None
-            if self.verificar("PC_MAP") or self.verificar("PC_FILTER"):
+            if self.tipo_atual in ("PC_MAP", "PC_FILTER"):
                 transformacao = self.transformacao()
 
             saida = self.saida()
 
             dependencias = None
-            if self.verificar("PC_AFTER"):
+            if self.tipo_atual == "PC_AFTER":
                 dependencias = self.dependencias()
 
             self.consumir("FECHA_CHAVES")
@@ -203,7 +347,7 @@ class AnalisadorSintatico:
             transformacao = None
 
             dependencias = None
-            if self.verificar("PC_AFTER"):
+            if self.tipo_atual == "PC_AFTER":
                 dependencias = self.dependencias()
 
         return origem, transformacao, saida, dependencias
@@ -221,9 +365,10 @@ class AnalisadorSintatico:
         return Saida(destino)
 
     def transformacao(self):
-        if self.verificar("PC_MAP"):
+        tipo = self.tipo_atual
+        if tipo == "PC_MAP":
             return self.transformacao_map()
-        elif self.verificar("PC_FILTER"):
+        elif tipo == "PC_FILTER":
             return self.transformacao_filter()
         else:
             raise ErroSintatico(
@@ -233,39 +378,41 @@ class AnalisadorSintatico:
             )
 
     def transformacao_map(self):
-        self.consumir("PC_MAP")
+        self._consume_fast("PC_MAP")
         campo = self.consumir("IDENTIFICADOR")
         self.consumir("ATRIBUICAO")
         valor = self.valor()
         return TransformacaoMap(campo, valor)
 
     def transformacao_filter(self):
-        self.consumir("PC_FILTER")
+        self._consume_fast("PC_FILTER")
         expr = self.expressao_ou()
         return TransformacaoFilter(expr)
 
     def expressao_ou(self):
-        esquerda = self.expressao_e()
+        expressao_e = self.expressao_e
+        esquerda = expressao_e()
 
-        while self.verificar("PC_OR"):
+        while self.tipo_atual == "PC_OR":
             self.avancar()
-            direita = self.expressao_e()
+            direita = expressao_e()
             esquerda = ExpressaoBinaria(esquerda, "or", direita)
 
         return esquerda
 
     def expressao_e(self):
-        esquerda = self.expressao_comparacao()
+        expressao_comparacao = self.expressao_comparacao
+        esquerda = expressao_comparacao()
 
-        while self.verificar("PC_AND"):
+        while self.tipo_atual == "PC_AND":
             self.avancar()
-            direita = self.expressao_comparacao()
+            direita = expressao_comparacao()
             esquerda = ExpressaoBinaria(esquerda, "and", direita)
 
         return esquerda
 
     def expressao_comparacao(self):
-        if self.verificar("ABRE_PARENTESES"):
+        if self.tipo_atual == "ABRE_PARENTESES":
             self.avancar()
             expr = self.expressao_ou()
             self.consumir("FECHA_PARENTESES")
@@ -277,53 +424,52 @@ class AnalisadorSintatico:
         return ExpressaoComparacao(campo, operador, valor)
 
     def campo(self):
-        campo = self.consumir("IDENTIFICADOR")
+        consumir = self.consumir
+        campo = consumir("IDENTIFICADOR")
 
-        while self.verificar("PONTO"):
+        while self.tipo_atual == "PONTO":
             self.avancar()
-            campo += "." + self.consumir("IDENTIFICADOR")
+            campo += "." + consumir("IDENTIFICADOR")
 
         return campo
 
     def operador_comparacao(self):
-        operadores = ["IGUAL", "DIFERENTE", "MENOR", "MAIOR", "MENOR_IGUAL", "MAIOR_IGUAL"]
-
-        if self.token_atual and self.token_atual.tipo in operadores:
-            op = self.token_atual.lexema
+        if self.tipo_atual in OPERADORES_COMPARACAO:
+            lexema = self.lexemas[self.posicao]
             self.avancar()
-            return op
+            return lexema
         else:
+            token = self.token_atual
             raise ErroSintatico(
                 "Esperado operador de comparação (==, !=, <, >, <=, >=)",
-                self.token_atual.linha if self.token_atual else None,
-                self.token_atual.coluna if self.token_atual else None
+                token.linha if token else None,
+                token.coluna if token else None
             )
 
     def valor(self):
-        if self.verificar("STRING"):
-            valor = self.consumir("STRING").strip("'")
-            return valor
-        elif self.verificar("NUMERO"):
-            valor = self.consumir("NUMERO")
-            return float(valor) if '.' in valor else int(valor)
-        elif self.verificar("IDENTIFICADOR"):
-            return self.consumir("IDENTIFICADOR")
-        else:
+        conversor = CONVERSORES_VALOR.get(self.tipo_atual)
+
+        if conversor is None:
+            token = self.token_atual
             raise ErroSintatico(
                 "Esperado valor (string, número ou identificador)",
-                self.token_atual.linha if self.token_atual else None,
-                self.token_atual.coluna if self.token_atual else None
+                token.linha if token else None,
+                token.coluna if token else None
             )
 
+        lexema = self.lexemas[self.posicao]
+        self.avancar()
+        return conversor(lexema)
+
     def dependencias(self):
-        self.consumir("PC_AFTER")
+        self._consume_fast("PC_AFTER")
 
-        deps = []
-        deps.append(self.consumir("IDENTIFICADOR"))
+        consumir = self.consumir
+        deps = [consumir("IDENTIFICADOR")]
 
-        while self.verificar("VIRGULA"):
+        while self.tipo_atual == "VIRGULA":
             self.avancar()
-            deps.append(self.consumir("IDENTIFICADOR"))
+            deps.append(consumir("IDENTIFICADOR"))
 
         return deps
 
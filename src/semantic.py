@@ -1,15 +1,18 @@
 import sys
 import re
-from collections import defaultdict
+from collections import deque
+from typing import List, Optional
 
 class Task:
-    def __init__(self, name, kind, inputs=None, outputs=None, depends=None, lineno=0):
-        self.name = name
-        self.kind = kind  
-        self.inputs = inputs or []
-        self.outputs = outputs or []
-        self.depends = depends or []
-        self.lineno = lineno
+    def __init__(self, name: str, kind: str, inputs: Optional[List[str]] = None,
+                 outputs: Optional[List[str]] = None, depends: Optional[List[str]] = None,
+                 lineno: int = 0) -> None:
+        self.name: str = name
+        self.kind: str = kind  
+        self.inputs: List[str] = inputs or []
+        self.outputs: List[str] = outputs or []
+        self.depends: List[str] = depends or []
+        self.lineno: int = lineno
 
     def __repr__(self):
         return f"Task({self.name}, {self.kind}, in={self.inputs}, out={self.outputs}, dep={self.depends})"
@@ -17,12 +20,14 @@ class Task:
 class SymbolTable:
     def __init__(self):
         self.tasks = {}  
+        self.version = 0
 
     def add(self, task, errors):
         if task.name in self.tasks:
             errors.append(f"[E-DUP] Tarefa '{task.name}' já foi declarada (linha {task.lineno}).")
         else:
             self.tasks[task.name] = task
+            self.version += 1
 
     def __contains__(self, name):
         return name in self.tasks
@@ -38,39 +43,50 @@ class ParserNaive:
     KV_LINE = re.compile(r'^\s*(inputs|outputs|depends_on)\s*:\s*(.+)$', re.IGNORECASE)
 
     @staticmethod
-    def remove_comment(text):
-        comment_pos = text.find('#')
-        if comment_pos != -1:
-            return text[:comment_pos].strip()
-        return text.strip()
+    def remove_comment(text: str) -> str:
+        # A maioria das linhas não tem comentário: o teste com 'in' evita calcular o índice
+        if '#' not in text:
+            return text.strip()
+        return text[:text.index('#')].strip()
 
-    def parse_file(self, path):
+    def parse_file(self, path: str) -> List[Task]:
         with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+            lines: List[str] = f.readlines()
 
-        tasks = []
-        cur = None
+        tasks: List[Task] = []
+        cur: Optional[Task] = None
+        remove_comment = self.remove_comment
+        task_match = self.TASK_HEADER.match
+        kv_match = self.KV_LINE.match
         for idx, line in enumerate(lines, start=1):
-            line_stripped = self.remove_comment(line)
+            line_stripped = remove_comment(line)
 
             if not line_stripped:
                 continue
-            if line_stripped.lower() == "end":
+            # Só linhas de 3 caracteres podem ser "end": evita o lower() das demais
+            if len(line_stripped) == 3 and line_stripped.lower() == "end":
                 if cur:
                     tasks.append(cur)
                     cur = None
                 continue
 
-            m = self.TASK_HEADER.match(line_stripped)
-            if m:
-                name, kind = m.group(1), m.group(2).upper()
-                cur = Task(name=name, kind=kind, lineno=idx)
+            # Só linhas começando com 't' podem ser cabeçalho de tarefa,
+            # e só 'i', 'o' ou 'd' podem ser inputs/outputs/depends_on
+            first = line_stripped[0]
+            if first in "tT":
+                m = task_match(line_stripped)
+                if m:
+                    name, kind = m.group(1), m.group(2).upper()
+                    cur = Task(name=name, kind=kind, lineno=idx)
                 continue
 
-            m = self.KV_LINE.match(line_stripped)
+            if first not in "iIoOdD":
+                continue
+
+            m = kv_match(line_stripped)
             if m and cur:
                 key = m.group(1).lower()
-                value_part = self.remove_comment(m.group(2))
+                value_part = remove_comment(m.group(2))
                 vals = [v.strip() for v in value_part.split(",") if v.strip()]
                 if key == "inputs":
                     cur.inputs.extend(vals)
@@ -85,51 +101,56 @@ class SemanticAnalyzer:
     def __init__(self, symtab):
         self.symtab = symtab
         self.errors = []
+        self.produced_by = set()
 
     def run(self):
+        # Artefatos produzidos por alguma tarefa, montado uma vez e usado pelas verificações
+        self.produced_by = {o for t in self.symtab.all() for o in t.outputs}
+
         self._check_undeclared_dependencies()
         self._check_input_producers()
         self._check_cycles()
         return self.errors
 
     def _check_undeclared_dependencies(self):
-        for t in self.symtab.all():
+        sym_tasks = self.symtab.tasks
+        errors_append = self.errors.append
+        for t in sym_tasks.values():
             for d in t.depends:
-                if d not in self.symtab:
-                    self.errors.append(f"[E-DEP] '{t.name}' depende de '{d}', que não existe (linha {t.lineno}).")
+                if d not in sym_tasks:
+                    errors_append(f"[E-DEP] '{t.name}' depende de '{d}', que não existe (linha {t.lineno}).")
 
     def _check_input_producers(self):
-        produced_by = defaultdict(list)
-        for t in self.symtab.all():
-            for o in t.outputs:
-                produced_by[o].append(t.name)
-
+        produced_by = self.produced_by
+        errors_append = self.errors.append
         for t in self.symtab.all():
             for i in t.inputs:
                 if i not in produced_by:
-                    self.errors.append(f"[E-IN] Input '{i}' de '{t.name}' não é produzido por nenhuma tarefa (linha {t.lineno}).")
+                    errors_append(f"[E-IN] Input '{i}' de '{t.name}' não é produzido por nenhuma tarefa (linha {t.lineno}).")
 
     def _check_cycles(self):
         graph = {t.name: t.depends for t in self.symtab.all()}
-        visited, stack = set(), set()
-
-        def dfs(u):
-            if u in stack:
-                return True
-            if u in visited:
-                return False
-            visited.add(u)
-            stack.add(u)
-            for v in graph.get(u, []):
-                if v in graph and dfs(v):
-                    return True
-            stack.remove(u)
-            return False
-
-        for node in graph:
-            if dfs(node):
-                self.errors.append("[E-CYCLE] Ciclo detectado no grafo de dependências.")
-                break
+        indegree = {name: 0 for name in graph}
+        adj = {name: [] for name in graph}
+
+        for name, deps in graph.items():
+            for d in deps:
+                if d in graph:
+                    adj[d].append(name)
+                    indegree[name] += 1
+
+        q = deque([name for name, degree in indegree.items() if degree == 0])
+        visited = 0
+        while q:
+            u = q.popleft()
+            visited += 1
+            for v in adj[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    q.append(v)
+
+        if visited < len(indegree):
+            self.errors.append("[E-CYCLE] Ciclo detectado no grafo de dependências.")
 
 def build_symbol_table(tasks):
     sym = SymbolTable()
@@ -8,8 +8,15 @@ import json
 import sys
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, List, NamedTuple, Optional, Set
+
+try:
+    from orjson import loads as json_loads  # mais rápido; aceita bytes diretamente
+except ImportError:
+    from json import loads as json_loads  # type: ignore[assignment]
 
 
 class Colors:
@@ -25,6 +32,29 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Prefixos das linhas de log de cada tarefa, já com a cor aplicada
+INFO = f"{Colors.CYAN}  -> "
+OK = f"{Colors.GREEN}  -> "
+ERROR = f"{Colors.RED}  -> "
+
+# Estados das tarefas, guardados como inteiros na lista indexada por tarefa
+PENDING, RUNNING, COMPLETED, FAILED = range(4)
+STATE_NAMES = ('pending', 'running', 'completed', 'failed')
+
+# Intervalo (mínimo, máximo) do atraso simulado, em segundos, por tipo de tarefa
+DELAY_RANGES = {
+    'EXTRACT': (0.3, 0.8),
+    'TRANSFORM': (0.4, 1.0),
+    'LOAD': (0.2, 0.6),
+}
+
+
+def write_lines(lines: List[str]):
+    """Escreve várias linhas de log de uma vez, com uma única chamada a stdout"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
 class ArtifactManager:
     """
     Gerencia o rastreamento de artefatos (dados intermediários) durante a execução.
@@ -34,23 +64,34 @@ class ArtifactManager:
     def __init__(self):
         self.available_artifacts: Set[str] = set()
         self.artifact_producers: Dict[str, str] = {}  # artefato -> tarefa que o produziu
+        self.lock = threading.Lock()  # tarefas de uma mesma onda registram em paralelo
 
     def register_artifact(self, artifact_name: str, producer_task: str):
         """Registra que um artefato foi produzido por uma tarefa"""
-        self.available_artifacts.add(artifact_name)
-        self.artifact_producers[artifact_name] = producer_task
+        with self.lock:
+            self.available_artifacts.add(artifact_name)
+            self.artifact_producers[artifact_name] = producer_task
 
     def is_available(self, artifact_name: str) -> bool:
         """Verifica se um artefato está disponível para uso"""
         return artifact_name in self.available_artifacts
 
+    def all_available(self, inputs: List[str]) -> bool:
+        """Verifica de uma vez se todos os inputs estão disponíveis (caminho comum)"""
+        return self.available_artifacts.issuperset(inputs)
+
+    def missing_inputs(self, inputs: List[str]) -> List[str]:
+        """Lista os inputs indisponíveis; só é necessária quando all_available falha"""
+        return [inp for inp in inputs if inp not in self.available_artifacts]
+
     def check_inputs(self, inputs: List[str]) -> tuple[bool, List[str]]:
         """
         Verifica se todos os inputs necessários estão disponíveis.
         Retorna (sucesso, lista_de_faltantes)
         """
-        missing = [inp for inp in inputs if not self.is_available(inp)]
-        return (len(missing) == 0, missing)
+        if self.all_available(inputs):
+            return (True, [])
+        return (False, self.missing_inputs(inputs))
 
     def get_producer(self, artifact_name: str) -> str:
         """Retorna o nome da tarefa que produziu o artefato"""
@@ -63,77 +104,112 @@ class TaskExecutor:
     Simula operações EXTRACT, TRANSFORM e LOAD com delays e logs.
     """
 
-    def __init__(self, artifact_manager: ArtifactManager):
+    def __init__(self, artifact_manager: ArtifactManager, sleep_fn=time.sleep,
+                 rng: Optional[random.Random] = None):
         self.artifact_manager = artifact_manager
+        self.sleep_fn = sleep_fn  # substituível para rodar sem esperas (modo rápido, testes)
+        self.rng = rng if rng is not None else random.Random()
 
     def execute(self, task: Dict) -> bool:
         """
         Executa a simulação de uma tarefa.
         Retorna True se sucesso, False se falha.
         """
-        task_id = task['id']
-        task_type = task['type']
-        inputs = task.get('inputs', [])
-        outputs = task.get('outputs', [])
+        return self.run(task['id'], task['type'], task.get('inputs', []), task.get('outputs', []))
+
+    def run(self, task_id: str, task_type: str, inputs: List[str], outputs: List[str],
+            delay: Optional[float] = None, log: Optional[List[str]] = None) -> bool:
+        """
+        Executa a tarefa a partir dos campos já extraídos da IR.
+        Sem delay (não pré-calculado pelo PipelineSimulator), sorteia um pelo tipo.
+        As linhas de log são acumuladas em log; sem log, são escritas ao fim da tarefa.
+        """
+        if log is None:
+            log = []
+            success = self.run(task_id, task_type, inputs, outputs, delay, log)
+            write_lines(log)
+            return success
+
+        if task_type not in DELAY_RANGES:
+            log.append(f"{ERROR}Tipo de tarefa desconhecido: {task_type}{Colors.ENDC}")
+            return False
+
+        if delay is None:
+            delay = self.rng.uniform(*DELAY_RANGES[task_type])
 
         # Simula diferentes operações baseadas no tipo
         if task_type == 'EXTRACT':
-            return self._simulate_extract(task_id, outputs)
+            return self._simulate_extract(task_id, outputs, delay, log)
         elif task_type == 'TRANSFORM':
-            return self._simulate_transform(task_id, inputs, outputs)
-        elif task_type == 'LOAD':
-            return self._simulate_load(task_id, inputs)
+            return self._simulate_transform(task_id, inputs, outputs, delay, log)
         else:
-            print(f"{Colors.RED}  -> Tipo de tarefa desconhecido: {task_type}{Colors.ENDC}")
-            return False
+            return self._simulate_load(task_id, inputs, delay, log)
 
-    def _simulate_extract(self, task_id: str, outputs: List[str]) -> bool:
+    def _simulate_extract(self, task_id: str, outputs: List[str], delay: float, log: List[str]) -> bool:
         """Simula uma operação de EXTRACT (extração de dados)"""
-        print(f"{Colors.CYAN}  -> Extraindo dados da fonte...{Colors.ENDC}")
-        time.sleep(random.uniform(0.3, 0.8))  # Simula tempo de extração
+        log.append(f"{INFO}Extraindo dados da fonte...{Colors.ENDC}")
+        self.sleep_fn(delay)  # Simula tempo de extração
 
         # Registra os artefatos produzidos
-        for output in outputs:
-            self.artifact_manager.register_artifact(output, task_id)
-            print(f"{Colors.GREEN}  -> Artefato gerado: '{output}' OK{Colors.ENDC}")
-
+        self._register_outputs(task_id, outputs, log)
         return True
 
-    def _simulate_transform(self, task_id: str, inputs: List[str], outputs: List[str]) -> bool:
+    def _simulate_transform(self, task_id: str, inputs: List[str], outputs: List[str], delay: float,
+                            log: List[str]) -> bool:
         """Simula uma operação de TRANSFORM (transformação de dados)"""
         # Verifica se todos os inputs estão disponíveis
-        for inp in inputs:
-            if not self.artifact_manager.is_available(inp):
-                print(f"{Colors.RED}  -> Erro: Artefato '{inp}' não disponível X{Colors.ENDC}")
-                return False
-            producer = self.artifact_manager.get_producer(inp)
-            print(f"{Colors.CYAN}  -> Lendo artefato: '{inp}' (de {producer}) OK{Colors.ENDC}")
+        if not self._read_inputs(inputs, log):
+            return False
 
-        print(f"{Colors.CYAN}  -> Transformando dados...{Colors.ENDC}")
-        time.sleep(random.uniform(0.4, 1.0))  # Simula tempo de transformação
+        log.append(f"{INFO}Transformando dados...{Colors.ENDC}")
+        self.sleep_fn(delay)  # Simula tempo de transformação
 
         # Registra os artefatos produzidos
-        for output in outputs:
-            self.artifact_manager.register_artifact(output, task_id)
-            print(f"{Colors.GREEN}  -> Artefato gerado: '{output}' OK{Colors.ENDC}")
-
+        self._register_outputs(task_id, outputs, log)
         return True
 
-    def _simulate_load(self, task_id: str, inputs: List[str]) -> bool:
+    def _simulate_load(self, task_id: str, inputs: List[str], delay: float, log: List[str]) -> bool:
         """Simula uma operação de LOAD (carregamento de dados)"""
         # Verifica se todos os inputs estão disponíveis
+        if not self._read_inputs(inputs, log):
+            return False
+
+        log.append(f"{INFO}Carregando dados no destino final...{Colors.ENDC}")
+        self.sleep_fn(delay)  # Simula tempo de carregamento
+
+        log.append(f"{OK}Dados carregados com sucesso OK{Colors.ENDC}")
+        return True
+
+    def _read_inputs(self, inputs: List[str], msgs: List[str]) -> bool:
+        """Acumula em msgs a leitura de cada input; retorna False no primeiro faltante"""
+        manager = self.artifact_manager
+        missing = () if manager.all_available(inputs) else set(manager.missing_inputs(inputs))
+
         for inp in inputs:
-            if not self.artifact_manager.is_available(inp):
-                print(f"{Colors.RED}  -> Erro: Artefato '{inp}' não disponível X{Colors.ENDC}")
+            if inp in missing:
+                msgs.append(f"{ERROR}Erro: Artefato '{inp}' não disponível X{Colors.ENDC}")
                 return False
-            producer = self.artifact_manager.get_producer(inp)
-            print(f"{Colors.CYAN}  -> Lendo artefato: '{inp}' (de {producer}) OK{Colors.ENDC}")
+            producer = manager.get_producer(inp)
+            msgs.append(f"{INFO}Lendo artefato: '{inp}' (de {producer}) OK{Colors.ENDC}")
+        return True
 
-        print(f"{Colors.CYAN}  -> Carregando dados no destino final...{Colors.ENDC}")
-        time.sleep(random.uniform(0.2, 0.6))  # Simula tempo de carregamento
+    def _register_outputs(self, task_id: str, outputs: List[str], msgs: List[str]):
+        """Registra os artefatos produzidos e acumula em msgs as mensagens correspondentes"""
+        for output in outputs:
+            self.artifact_manager.register_artifact(output, task_id)
+            msgs.append(f"{OK}Artefato gerado: '{output}' OK{Colors.ENDC}")
 
-        print(f"{Colors.GREEN}  -> Dados carregados com sucesso OK{Colors.ENDC}")
-        return True
+
+class TaskSpec(NamedTuple):
+    """Campos de uma tarefa extraídos da IR uma única vez"""
+    position: int  # posição da tarefa em task_states/task_times
+    id: str
+    type: str
+    inputs: List[str]
+    outputs: List[str]
+    depends_on: List[str]
+    dep_indices: List[Optional[int]]  # None quando a dependência não é uma tarefa da IR
+    delay: Optional[float]  # atraso simulado, sorteado no load_ir
 
 
 class PipelineSimulator:
@@ -142,21 +218,30 @@ class PipelineSimulator:
     Carrega a IR, valida e executa as tarefas na ordem correta.
     """
 
-    def __init__(self, ir_file_path: str):
+    def __init__(self, ir_file_path: str, fast_mode: bool = False,
+                 rng: Optional[random.Random] = None, max_workers: Optional[int] = None):
         self.ir_file_path = ir_file_path
         self.ir: Dict = {}
+        self.tasks_by_id: Dict[str, TaskSpec] = {}
+        self.fast_mode = fast_mode
+        self.rng = rng if rng is not None else random.Random()  # random.Random(seed) repete os atrasos
         self.artifact_manager = ArtifactManager()
-        self.task_executor = TaskExecutor(self.artifact_manager)
-        self.task_states: Dict[str, str] = {}  # task_id -> estado (pending, running, completed, failed)
-        self.task_times: Dict[str, float] = {}  # task_id -> tempo de execução
+        sleep_fn = (lambda seconds: None) if fast_mode else time.sleep
+        self.task_executor = TaskExecutor(self.artifact_manager, sleep_fn=sleep_fn, rng=self.rng)
+        self.task_index: Dict[str, int] = {}  # task_id -> posição nas listas abaixo
+        self.artifact_producers: Dict[str, int] = {}  # artefato -> índice da tarefa que o produz
+        self.task_states: List[int] = []  # estado de cada tarefa (PENDING, RUNNING, COMPLETED, FAILED)
+        self.task_times: List[Optional[float]] = []  # tempo de execução de cada tarefa
+        self.state_lock = threading.Lock()  # protege task_states/task_times entre threads
+        self.max_workers = max_workers
         self.start_time = None
         self.end_time = None
 
     def load_ir(self) -> bool:
         """Carrega e valida o arquivo IR JSON"""
         try:
-            with open(self.ir_file_path, 'r', encoding='utf-8') as f:
-                self.ir = json.load(f)
+            with open(self.ir_file_path, 'rb') as f:
+                self.ir = json_loads(f.read())
 
             # Valida estrutura básica
             required_keys = ['metadata', 'tasks', 'execution_order']
@@ -165,9 +250,31 @@ class PipelineSimulator:
                     print(f"{Colors.RED}Erro: IR inválida - faltando chave '{key}'{Colors.ENDC}")
                     return False
 
-            # Inicializa estados das tarefas
-            for task in self.ir['tasks']:
-                self.task_states[task['id']] = 'pending'
+            # Cada tarefa recebe um índice inteiro; estados e tempos ficam em listas
+            tasks = self.ir['tasks']
+            task_index = self.task_index
+            producers = self.artifact_producers
+            for task in tasks:
+                index = task_index.setdefault(task['id'], len(task_index))
+                for output in task.get('outputs', []):
+                    producers.setdefault(output, index)
+            self.task_states = [PENDING] * len(task_index)
+            self.task_times = [None] * len(task_index)
+
+            # Índice por id, já com os campos extraídos e o atraso simulado de cada tarefa
+            rng = self.rng
+            for task in tasks:
+                task_id = task['id']
+                task_type = task.get('type')
+                depends_on = task.get('depends_on', [])
+                delay_range = DELAY_RANGES.get(task_type)
+                delay = rng.uniform(*delay_range) if delay_range is not None else None
+
+                self.tasks_by_id[task_id] = TaskSpec(
+                    task_index[task_id], task_id, task_type, task.get('inputs', []),
+                    task.get('outputs', []), depends_on,
+                    [task_index.get(dep) for dep in depends_on], delay,
+                )
 
             return True
 
@@ -193,58 +300,115 @@ class PipelineSimulator:
         print(f"{Colors.BOLD}Compilado em:{Colors.ENDC} {metadata.get('generated_at', 'N/A')}")
         print()
 
-    def verify_dependencies(self, task: Dict) -> bool:
+    def verify_dependencies(self, depends_on: List[str], dep_indices: List[Optional[int]],
+                            log: List[str]) -> bool:
         """Verifica se todas as dependências de uma tarefa foram completadas"""
-        depends_on = task.get('depends_on', [])
-
-        for dep in depends_on:
-            if self.task_states.get(dep) != 'completed':
-                print(f"{Colors.YELLOW}  -> Aguardando dependência: {dep} (estado: {self.task_states.get(dep)}){Colors.ENDC}")
-                return False
-
-        # Se há dependências, mostra que foram satisfeitas
-        if depends_on:
-            for dep in depends_on:
-                print(f"{Colors.GREEN}  -> Dependência satisfeita: {dep} OK{Colors.ENDC}")
+        # Uma única passada separa dependências satisfeitas das pendentes
+        states = self.task_states
+        satisfied = []
+        unsatisfied = []
+        for dep, index in zip(depends_on, dep_indices):
+            state = states[index] if index is not None else None
+            if state == COMPLETED:
+                satisfied.append(dep)
+            else:
+                unsatisfied.append((dep, STATE_NAMES[state] if state is not None else None))
+
+        if unsatisfied:
+            log.extend(f"{Colors.YELLOW}  -> Aguardando dependência: {dep} (estado: {state}){Colors.ENDC}"
+                       for dep, state in unsatisfied)
+            return False
 
+        log.extend(f"{OK}Dependência satisfeita: {dep} OK{Colors.ENDC}" for dep in satisfied)
         return True
 
-    def execute_task(self, task: Dict, task_number: int, total_tasks: int) -> bool:
-        """Executa uma tarefa individual"""
-        task_id = task['id']
-        task_type = task['type']
+    def execute_task(self, task: TaskSpec, task_number: int, total_tasks: int) -> bool:
+        """
+        Executa uma tarefa individual.
+        O log da tarefa é escrito de uma só vez ao final, para não se misturar
+        com o das outras tarefas da mesma onda.
+        """
+        log: List[str] = []
+        success = self._execute_task(task, task_number, total_tasks, log)
+        write_lines(log)
+        return success
+
+    def _execute_task(self, task: TaskSpec, task_number: int, total_tasks: int, log: List[str]) -> bool:
+        position = task.position
 
         # Cabeçalho da tarefa
-        print(f"{Colors.BOLD}{Colors.BLUE}[{task_number}/{total_tasks}] Executando: {task_id} ({task_type}){Colors.ENDC}")
+        log.append(f"{Colors.BOLD}{Colors.BLUE}[{task_number}/{total_tasks}] Executando: {task.id} ({task.type}){Colors.ENDC}")
 
         # Verifica dependências
-        if not self.verify_dependencies(task):
-            print(f"{Colors.RED}  -> Erro: Dependências não satisfeitas X{Colors.ENDC}")
+        if not self.verify_dependencies(task.depends_on, task.dep_indices, log):
+            log.append(f"{ERROR}Erro: Dependências não satisfeitas X{Colors.ENDC}")
             return False
 
         # Marca como em execução
-        self.task_states[task_id] = 'running'
+        with self.state_lock:
+            self.task_states[position] = RUNNING
 
         # Executa a tarefa
         start = time.time()
-        success = self.task_executor.execute(task)
+        success = self.task_executor.run(task.id, task.type, task.inputs, task.outputs, task.delay, log)
         end = time.time()
 
         execution_time = end - start
-        self.task_times[task_id] = execution_time
 
         # Atualiza estado
+        with self.state_lock:
+            self.task_times[position] = execution_time
+            self.task_states[position] = COMPLETED if success else FAILED
+
         if success:
-            self.task_states[task_id] = 'completed'
-            print(f"{Colors.GREEN}  -> Tempo: {execution_time:.2f}s{Colors.ENDC}")
-            print(f"{Colors.GREEN}  -> Status: COMPLETO OK{Colors.ENDC}")
+            log.append(f"{OK}Tempo: {execution_time:.2f}s{Colors.ENDC}")
+            log.append(f"{OK}Status: COMPLETO OK{Colors.ENDC}")
         else:
-            self.task_states[task_id] = 'failed'
-            print(f"{Colors.RED}  -> Status: FALHOU X{Colors.ENDC}")
+            log.append(f"{ERROR}Status: FALHOU X{Colors.ENDC}")
+        log.append("")
 
-        print()
         return success
 
+    def compute_waves(self, execution_order: List[str]) -> List[List[TaskSpec]]:
+        """
+        Agrupa as tarefas em ondas pelo nível no grafo de dependências.
+        O produtor de cada input conta como dependência implícita, mesmo sem depends_on,
+        então o grafo usado é o de depends_on somado às arestas produtor -> consumidor.
+        Tarefas de uma mesma onda não dependem entre si e podem executar em paralelo.
+        """
+        tasks = [self.tasks_by_id[task_id] for task_id in execution_order]
+        producers = self.artifact_producers
+        rank = {task.position: n for n, task in enumerate(tasks)}  # posição em execution_order
+
+        successors: List[List[TaskSpec]] = [[] for _ in tasks]
+        pending = [0] * len(tasks)
+        for n, task in enumerate(tasks):
+            predecessors = {i for i in task.dep_indices if i is not None}
+            predecessors.update(producers[inp] for inp in task.inputs if inp in producers)
+            predecessors.discard(task.position)
+            for i in predecessors:
+                if i in rank:
+                    successors[rank[i]].append(task)
+                    pending[n] += 1
+
+        # Kahn por níveis; dentro de uma onda vale a ordem de execution_order
+        waves: List[List[TaskSpec]] = []
+        wave = [task for n, task in enumerate(tasks) if not pending[n]]
+        while wave:
+            waves.append(wave)
+            ready = []
+            for task in wave:
+                for succ in successors[rank[task.position]]:
+                    n = rank[succ.position]
+                    pending[n] -= 1
+                    if not pending[n]:
+                        ready.append(succ)
+            wave = sorted(ready, key=lambda t: rank[t.position])
+
+        # Tarefas presas num ciclo do grafo combinado executam uma a uma, na ordem original
+        waves.extend([task] for n, task in enumerate(tasks) if pending[n])
+        return waves
+
     def run(self) -> bool:
         """Executa a simulação completa do pipeline"""
         # Carrega a IR
@@ -257,19 +421,24 @@ class PipelineSimulator:
         # Inicia cronômetro
         self.start_time = time.time()
 
-        # Executa tarefas na ordem definida
+        # Executa as tarefas onda a onda; dentro de uma onda, em paralelo
         execution_order = self.ir['execution_order']
         total_tasks = len(execution_order)
-        tasks_by_id = {task['id']: task for task in self.ir['tasks']}
-
-        for i, task_id in enumerate(execution_order, 1):
-            task = tasks_by_id[task_id]
-            success = self.execute_task(task, i, total_tasks)
-
-            if not success:
-                self.end_time = time.time()
-                self.print_summary(success=False)
-                return False
+        task_number = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for wave in self.compute_waves(execution_order):
+                numbers = range(task_number + 1, task_number + len(wave) + 1)
+                task_number += len(wave)
+                results = list(executor.map(
+                    lambda task, number: self.execute_task(task, number, total_tasks),
+                    wave, numbers
+                ))
+
+                if not all(results):
+                    self.end_time = time.time()
+                    self.print_summary(success=False)
+                    return False
 
         # Finaliza cronômetro
         self.end_time = time.time()
@@ -290,7 +459,7 @@ class PipelineSimulator:
         print()
 
         # Estatísticas
-        completed = sum(1 for state in self.task_states.values() if state == 'completed')
+        completed = self.task_states.count(COMPLETED)
         total = len(self.task_states)
         print(f"{Colors.BOLD}Tarefas executadas:{Colors.ENDC} {completed}/{total}")
 
@@ -299,13 +468,18 @@ class PipelineSimulator:
             print(f"{Colors.BOLD}Tempo total:{Colors.ENDC} {total_time:.2f}s")
 
         # Detalhamento por tarefa
-        if self.task_times:
+        if any(exec_time is not None for exec_time in self.task_times):
             print()
             print(f"{Colors.BOLD}Tempo por tarefa:{Colors.ENDC}")
-            for task_id, exec_time in self.task_times.items():
-                state = self.task_states[task_id]
-                color = Colors.GREEN if state == 'completed' else Colors.RED
-                print(f"  {color}• {task_id}: {exec_time:.2f}s ({state}){Colors.ENDC}")
+            # Segue a ordem de execução, não a ordem em que as threads terminaram
+            for task_id in self.ir['execution_order']:
+                index = self.task_index[task_id]
+                exec_time = self.task_times[index]
+                if exec_time is None:
+                    continue
+                state = self.task_states[index]
+                color = Colors.GREEN if state == COMPLETED else Colors.RED
+                print(f"  {color}• {task_id}: {exec_time:.2f}s ({STATE_NAMES[state]}){Colors.ENDC}")
 
         print(f"{Colors.BOLD}{Colors.HEADER}{'='*60}{Colors.ENDC}")
         print()
@@ -313,15 +487,19 @@ class PipelineSimulator:
 
 def main():
     """Função principal - CLI do simulador"""
-    if len(sys.argv) < 2:
-        print(f"{Colors.RED}Uso: python simulator.py <arquivo_ir.json>{Colors.ENDC}")
+    args = [arg for arg in sys.argv[1:] if arg != '--fast']
+    fast_mode = len(args) != len(sys.argv) - 1
+
+    if not args:
+        print(f"{Colors.RED}Uso: python simulator.py <arquivo_ir.json> [--fast]{Colors.ENDC}")
         print(f"{Colors.YELLOW}Exemplo: python simulator.py demo/pipeline_simples.json{Colors.ENDC}")
+        print(f"{Colors.YELLOW}  --fast: executa sem os atrasos simulados{Colors.ENDC}")
         sys.exit(1)
 
-    ir_file = sys.argv[1]
+    ir_file = args[0]
 
     # Cria e executa o simulador
-    simulator = PipelineSimulator(ir_file)
+    simulator = PipelineSimulator(ir_file, fast_mode=fast_mode)
     success = simulator.run()
 
     # Retorna código de saída apropriado